@@ -74,7 +74,7 @@ setup(
     package_data={"stable_baselines3": ["py.typed", "version.txt"]},
     install_requires=[
         "gym>=0.17",
-        "numpy",
+        "numpy>=1.17",
         "torch>=1.4.0",
         # For saving models
         "cloudpickle",
@@ -374,6 +374,17 @@ class BaseAlgorithm(ABC):
         callback.init_callback(self)
         return callback
 
+    @staticmethod
+    def _callback_reads_locals(callback: BaseCallback) -> bool:
+        """
+        Whether the local variables of ``collect_rollouts()`` must be passed to the callback at every step.
+        The default callback (used when no callback is passed to ``learn()``) does not read them.
+
+        :param callback: Callback returned by ``_init_callback()``
+        :return:
+        """
+        return not (isinstance(callback, ConvertCallback) and callback.callback is None)
+
     def _setup_learn(
         self,
         total_timesteps: int,
@@ -441,18 +452,26 @@ class BaseAlgorithm(ABC):
         """
         Retrieve reward, episode length, episode success and update the buffer
         if using Monitor wrapper or a GoalEnv.
+        When the termination signals are given, only the infos of the envs
+        that finished an episode are checked (the episode info and the success
+        are only reported at the end of an episode).
 
         :param infos: List of additional information about the transition.
         :param dones: Termination signals
         """
         if dones is None:
-            dones = np.array([False] * len(infos))
-        for idx, info in enumerate(infos):
-            maybe_ep_info = info.get("episode")
-            maybe_is_success = info.get("is_success")
+            for info in infos:
+                maybe_ep_info = info.get("episode")
+                if maybe_ep_info is not None:
+                    self.ep_info_buffer.extend([maybe_ep_info])
+            return
+
+        for idx in np.flatnonzero(dones):
+            maybe_ep_info = infos[idx].get("episode")
+            maybe_is_success = infos[idx].get("is_success")
             if maybe_ep_info is not None:
                 self.ep_info_buffer.extend([maybe_ep_info])
-            if maybe_is_success is not None and dones[idx]:
+            if maybe_is_success is not None:
                 self.ep_success_buffer.append(maybe_is_success)
 
     def get_env(self) -> Optional[VecEnv]:
@@ -541,7 +560,7 @@ class BaseAlgorithm(ABC):
     def set_random_seed(self, seed: Optional[int] = None) -> None:
         """
         Set the seed of the pseudo-random generators
-        (python, numpy, pytorch, gym, action_space)
+        (python, numpy, pytorch, gym, action_space and the buffers of the algorithm)
 
         :param seed:
         """
@@ -668,6 +687,8 @@ class BaseAlgorithm(ABC):
             env = cls._wrap_env(env, data["verbose"])
             # Check if given env is valid
             check_for_correct_spaces(env, data["observation_space"], data["action_space"])
+            # The buffers are created with the number of envs of the new environment
+            data["n_envs"] = env.num_envs
         else:
             # Use stored env, if one exists. If not, continue as is (can be used for predict)
             if "env" in data:
@@ -1,6 +1,6 @@
 import warnings
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generator, List, Optional, Union
+from typing import Any, Dict, Generator, List, Optional, Tuple, Union
 
 import numpy as np
 import torch as th
@@ -13,6 +13,7 @@ from stable_baselines3.common.type_aliases import (
     ReplayBufferSamples,
     RolloutBufferSamples,
 )
+from stable_baselines3.common.utils import array_to_device
 from stable_baselines3.common.vec_env import VecNormalize
 
 try:
@@ -53,6 +54,30 @@ class BaseBuffer(ABC):
         self.full = False
         self.device = device
         self.n_envs = n_envs
+        # Generator used to sample from the buffer, seeded from the global numpy RNG
+        # (it is re-seeded by ``set_random_seed()`` of the algorithm, see ``seed()``)
+        self.np_random = np.random.default_rng(np.random.randint(2 ** 31))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """
+        Restores pickled state.
+
+        :param state:
+        """
+        self.__dict__.update(state)
+        # Buffers saved with a previous version do not have their own generator
+        if "np_random" not in state:
+            self.seed()
+
+    def seed(self, seed: Optional[int] = None) -> None:
+        """
+        Seed the generator used to sample from the buffer.
+
+        :param seed: If ``None``, the generator is seeded from the global numpy RNG
+        """
+        if seed is None:
+            seed = np.random.randint(2 ** 31)
+        self.np_random = np.random.default_rng(seed)
 
     @staticmethod
     def swap_and_flatten(arr: np.ndarray) -> np.ndarray:
@@ -106,15 +131,16 @@ class BaseBuffer(ABC):
         :return:
         """
         upper_bound = self.buffer_size if self.full else self.pos
-        batch_inds = np.random.randint(0, upper_bound, size=batch_size)
+        batch_inds = self.np_random.integers(0, upper_bound, size=batch_size)
         return self._get_samples(batch_inds, env=env)
 
     @abstractmethod
     def _get_samples(
-        self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None
+        self, batch_inds: Union[np.ndarray, th.Tensor], env: Optional[VecNormalize] = None
     ) -> Union[ReplayBufferSamples, RolloutBufferSamples]:
         """
-        :param batch_inds:
+        :param batch_inds: Indices of the transitions to sample,
+            a NumPy array for the replay buffers or a tensor on ``self.device`` for the rollout buffers
         :param env:
         :return:
         """
@@ -122,7 +148,7 @@ class BaseBuffer(ABC):
 
     def to_torch(self, array: np.ndarray, copy: bool = True) -> th.Tensor:
         """
-        Convert a numpy array to a PyTorch tensor.
+        Convert a numpy array to a PyTorch tensor (see ``array_to_device()``).
         Note: it copies the data by default
 
         :param array:
@@ -130,9 +156,7 @@ class BaseBuffer(ABC):
             (may be useful to avoid changing things be reference)
         :return:
         """
-        if copy:
-            return th.tensor(array).to(self.device)
-        return th.as_tensor(array).to(self.device)
+        return array_to_device(array, self.device, copy=copy)
 
     @staticmethod
     def _normalize_obs(
@@ -181,7 +205,9 @@ class ReplayBuffer(BaseBuffer):
     ):
         super(ReplayBuffer, self).__init__(buffer_size, observation_space, action_space, device, n_envs=n_envs)
 
-        assert n_envs == 1, "Replay buffer only support single environment for now"
+        # Adjust buffer size: transitions from all envs are stored in one contiguous array
+        # of shape (buffer_size // n_envs, n_envs, ...), indexed by env at sampling time
+        self.buffer_size = max(buffer_size // n_envs, 1)
 
         # Check that the replay buffer can fit into the memory
         if psutil is not None:
@@ -230,17 +256,28 @@ class ReplayBuffer(BaseBuffer):
         done: np.ndarray,
         infos: List[Dict[str, Any]],
     ) -> None:
-        # Copy to avoid modification by reference
-        self.observations[self.pos] = np.array(obs).copy()
+
+        # Reshape needed when using multiple envs with discrete observations
+        # as numpy cannot broadcast (n_discrete,) to (n_discrete, 1)
+        if isinstance(self.observation_space, spaces.Discrete):
+            obs = np.asarray(obs).reshape((self.n_envs,) + self.obs_shape)
+            next_obs = np.asarray(next_obs).reshape((self.n_envs,) + self.obs_shape)
+
+        # Same, for actions
+        if isinstance(self.action_space, spaces.Discrete):
+            action = np.asarray(action).reshape((self.n_envs, self.action_dim))
+
+        # No explicit copy needed: assigning into the storage already copies the data
+        self.observations[self.pos] = np.asarray(obs)
 
         if self.optimize_memory_usage:
-            self.observations[(self.pos + 1) % self.buffer_size] = np.array(next_obs).copy()
+            self.observations[(self.pos + 1) % self.buffer_size] = np.asarray(next_obs)
         else:
-            self.next_observations[self.pos] = np.array(next_obs).copy()
+            self.next_observations[self.pos] = np.asarray(next_obs)
 
-        self.actions[self.pos] = np.array(action).copy()
-        self.rewards[self.pos] = np.array(reward).copy()
-        self.dones[self.pos] = np.array(done).copy()
+        self.actions[self.pos] = np.asarray(action)
+        self.rewards[self.pos] = np.asarray(reward)
+        self.dones[self.pos] = np.asarray(done)
 
         if self.handle_timeout_termination:
             self.timeouts[self.pos] = np.array([info.get("TimeLimit.truncated", False) for info in infos])
@@ -267,28 +304,32 @@ class ReplayBuffer(BaseBuffer):
         # Do not sample the element with index `self.pos` as the transitions is invalid
         # (we use only one array to store `obs` and `next_obs`)
         if self.full:
-            batch_inds = (np.random.randint(1, self.buffer_size, size=batch_size) + self.pos) % self.buffer_size
+            batch_inds = (self.np_random.integers(1, self.buffer_size, size=batch_size) + self.pos) % self.buffer_size
         else:
-            batch_inds = np.random.randint(0, self.pos, size=batch_size)
+            batch_inds = self.np_random.integers(0, self.pos, size=batch_size)
         return self._get_samples(batch_inds, env=env)
 
     def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> ReplayBufferSamples:
+        # Sample randomly the env idx, all envs share the same storage
+        # so the whole batch is gathered with a single fancy-indexing call per array
+        env_indices = self.np_random.integers(0, self.n_envs, size=(len(batch_inds),))
 
         if self.optimize_memory_usage:
-            next_obs = self._normalize_obs(self.observations[(batch_inds + 1) % self.buffer_size, 0, :], env)
+            next_obs = self._normalize_obs(self.observations[(batch_inds + 1) % self.buffer_size, env_indices, :], env)
         else:
-            next_obs = self._normalize_obs(self.next_observations[batch_inds, 0, :], env)
+            next_obs = self._normalize_obs(self.next_observations[batch_inds, env_indices, :], env)
 
         data = (
-            self._normalize_obs(self.observations[batch_inds, 0, :], env),
-            self.actions[batch_inds, 0, :],
+            self._normalize_obs(self.observations[batch_inds, env_indices, :], env),
+            self.actions[batch_inds, env_indices, :],
             next_obs,
             # Only use dones that are not due to timeouts
             # deactivated by default (timeouts is initialized as an array of False)
-            self.dones[batch_inds] * (1 - self.timeouts[batch_inds]),
-            self._normalize_reward(self.rewards[batch_inds], env),
+            (self.dones[batch_inds, env_indices] * (1 - self.timeouts[batch_inds, env_indices])).reshape(-1, 1),
+            self._normalize_reward(self.rewards[batch_inds, env_indices].reshape(-1, 1), env),
         )
-        return ReplayBufferSamples(*tuple(map(self.to_torch, data)))
+        # The sampled arrays are fresh copies (advanced indexing), no need to copy them again
+        return ReplayBufferSamples(*tuple(self.to_torch(array, copy=False) for array in data))
 
 
 class RolloutBuffer(BaseBuffer):
@@ -333,17 +374,34 @@ class RolloutBuffer(BaseBuffer):
         self.generator_ready = False
         self.reset()
 
-    def reset(self) -> None:
+    @staticmethod
+    def _reset_array(array: Optional[np.ndarray], shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        Reuse the already allocated memory of an array of the buffer when possible
+        (the array may have been flattened by ``get()``), otherwise allocate a new one.
+        The previous values are not cleared: every entry is overwritten
+        during the next rollout before the buffer can be sampled.
+
+        :param array: Array of the previous rollout (None if not allocated yet)
+        :param shape: Expected shape of the array
+        :return: The array with the expected shape
+        """
+        if array is None or array.size != int(np.prod(shape)) or not array.flags.c_contiguous:
+            return np.zeros(shape, dtype=np.float32)
+        return array.reshape(shape)
 
-        self.observations = np.zeros((self.buffer_size, self.n_envs) + self.obs_shape, dtype=np.float32)
-        self.actions = np.zeros((self.buffer_size, self.n_envs, self.action_dim), dtype=np.float32)
-        self.rewards = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.returns = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.episode_starts = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.values = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.log_probs = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.advantages = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
+    def reset(self) -> None:
+        scalar_shape = (self.buffer_size, self.n_envs)
+        self.observations = self._reset_array(self.observations, scalar_shape + self.obs_shape)
+        self.actions = self._reset_array(self.actions, scalar_shape + (self.action_dim,))
+        self.rewards = self._reset_array(self.rewards, scalar_shape)
+        self.returns = self._reset_array(self.returns, scalar_shape)
+        self.episode_starts = self._reset_array(self.episode_starts, scalar_shape)
+        self.values = self._reset_array(self.values, scalar_shape)
+        self.log_probs = self._reset_array(self.log_probs, scalar_shape)
+        self.advantages = self._reset_array(self.advantages, scalar_shape)
         self.generator_ready = False
+        self._device_data = None
         super(RolloutBuffer, self).reset()
 
     def compute_returns_and_advantage(self, last_values: th.Tensor, dones: np.ndarray) -> None:
@@ -367,7 +425,7 @@ class RolloutBuffer(BaseBuffer):
 
         """
         # Convert to numpy
-        last_values = last_values.clone().cpu().numpy().flatten()
+        last_values = last_values.detach().cpu().numpy().flatten()
 
         last_gae_lam = 0
         for step in reversed(range(self.buffer_size)):
@@ -412,19 +470,21 @@ class RolloutBuffer(BaseBuffer):
         if isinstance(self.observation_space, spaces.Discrete):
             obs = obs.reshape((self.n_envs,) + self.obs_shape)
 
-        self.observations[self.pos] = np.array(obs).copy()
-        self.actions[self.pos] = np.array(action).copy()
-        self.rewards[self.pos] = np.array(reward).copy()
-        self.episode_starts[self.pos] = np.array(episode_start).copy()
-        self.values[self.pos] = value.clone().cpu().numpy().flatten()
-        self.log_probs[self.pos] = log_prob.clone().cpu().numpy()
+        self.observations[self.pos] = np.asarray(obs)
+        self.actions[self.pos] = np.asarray(action)
+        self.rewards[self.pos] = np.asarray(reward)
+        self.episode_starts[self.pos] = np.asarray(episode_start)
+        # Store plain numpy arrays, detached from any autograd graph
+        # (no need to clone: the assignment already copies the data into the buffer)
+        self.values[self.pos] = value.detach().cpu().numpy().flatten()
+        self.log_probs[self.pos] = log_prob.detach().cpu().numpy()
         self.pos += 1
         if self.pos == self.buffer_size:
             self.full = True
 
     def get(self, batch_size: Optional[int] = None) -> Generator[RolloutBufferSamples, None, None]:
         assert self.full, ""
-        indices = np.random.permutation(self.buffer_size * self.n_envs)
+        indices = self.np_random.permutation(self.buffer_size * self.n_envs)
         # Prepare the data
         if not self.generator_ready:
 
@@ -439,8 +499,14 @@ class RolloutBuffer(BaseBuffer):
 
             for tensor in _tensor_names:
                 self.__dict__[tensor] = self.swap_and_flatten(self.__dict__[tensor])
+            # Send the whole rollout to the device at once,
+            # the minibatches are then gathered directly on the device
+            self._device_data = {tensor: self.to_torch(self.__dict__[tensor], copy=False) for tensor in _tensor_names}
             self.generator_ready = True
 
+        # Send the permutation to the device once, the minibatch indices are slices of it
+        indices = th.as_tensor(indices, device=self.device)
+
         # Return everything, don't create minibatches
         if batch_size is None:
             batch_size = self.buffer_size * self.n_envs
@@ -450,16 +516,15 @@ class RolloutBuffer(BaseBuffer):
             yield self._get_samples(indices[start_idx : start_idx + batch_size])
             start_idx += batch_size
 
-    def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> RolloutBufferSamples:
-        data = (
-            self.observations[batch_inds],
-            self.actions[batch_inds],
-            self.values[batch_inds].flatten(),
-            self.log_probs[batch_inds].flatten(),
-            self.advantages[batch_inds].flatten(),
-            self.returns[batch_inds].flatten(),
+    def _get_samples(self, batch_inds: th.Tensor, env: Optional[VecNormalize] = None) -> RolloutBufferSamples:
+        return RolloutBufferSamples(
+            observations=self._device_data["observations"][batch_inds],
+            actions=self._device_data["actions"][batch_inds],
+            old_values=self._device_data["values"][batch_inds].flatten(),
+            old_log_prob=self._device_data["log_probs"][batch_inds].flatten(),
+            advantages=self._device_data["advantages"][batch_inds].flatten(),
+            returns=self._device_data["returns"][batch_inds].flatten(),
         )
-        return RolloutBufferSamples(*tuple(map(self.to_torch, data)))
 
 
 class DictReplayBuffer(ReplayBuffer):
@@ -492,7 +557,7 @@ class DictReplayBuffer(ReplayBuffer):
         super(ReplayBuffer, self).__init__(buffer_size, observation_space, action_space, device, n_envs=n_envs)
 
         assert isinstance(self.obs_shape, dict), "DictReplayBuffer must be used with Dict obs space only"
-        assert n_envs == 1, "Replay buffer only support single environment for now"
+        self.buffer_size = max(buffer_size // n_envs, 1)
 
         # Check that the replay buffer can fit into the memory
         if psutil is not None:
@@ -512,8 +577,7 @@ class DictReplayBuffer(ReplayBuffer):
             for key, _obs_shape in self.obs_shape.items()
         }
 
-        # only 1 env is supported
-        self.actions = np.zeros((self.buffer_size, self.action_dim), dtype=action_space.dtype)
+        self.actions = np.zeros((self.buffer_size, self.n_envs, self.action_dim), dtype=action_space.dtype)
         self.rewards = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
         self.dones = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
 
@@ -552,16 +616,28 @@ class DictReplayBuffer(ReplayBuffer):
         done: np.ndarray,
         infos: List[Dict[str, Any]],
     ) -> None:
-        # Copy to avoid modification by reference
+        # No explicit copy needed: assigning into the storage already copies the data
         for key in self.observations.keys():
-            self.observations[key][self.pos] = np.array(obs[key]).copy()
+            obs_ = np.asarray(obs[key])
+            # Reshape needed when using multiple envs with discrete observations
+            # as numpy cannot broadcast (n_discrete,) to (n_discrete, 1)
+            if isinstance(self.observation_space.spaces[key], spaces.Discrete):
+                obs_ = obs_.reshape((self.n_envs,) + self.obs_shape[key])
+            self.observations[key][self.pos] = obs_
 
         for key in self.next_observations.keys():
-            self.next_observations[key][self.pos] = np.array(next_obs[key]).copy()
+            next_obs_ = np.asarray(next_obs[key])
+            if isinstance(self.observation_space.spaces[key], spaces.Discrete):
+                next_obs_ = next_obs_.reshape((self.n_envs,) + self.obs_shape[key])
+            self.next_observations[key][self.pos] = next_obs_
 
-        self.actions[self.pos] = np.array(action).copy()
-        self.rewards[self.pos] = np.array(reward).copy()
-        self.dones[self.pos] = np.array(done).copy()
+        # Same reshape, for actions
+        if isinstance(self.action_space, spaces.Discrete):
+            action = np.asarray(action).reshape((self.n_envs, self.action_dim))
+
+        self.actions[self.pos] = np.asarray(action)
+        self.rewards[self.pos] = np.asarray(reward)
+        self.dones[self.pos] = np.asarray(done)
 
         if self.handle_timeout_termination:
             self.timeouts[self.pos] = np.array([info.get("TimeLimit.truncated", False) for info in infos])
@@ -571,6 +647,50 @@ class DictReplayBuffer(ReplayBuffer):
             self.full = True
             self.pos = 0
 
+    def extend(
+        self,
+        obs: Dict[str, np.ndarray],
+        next_obs: Dict[str, np.ndarray],
+        action: np.ndarray,
+        reward: np.ndarray,
+        done: np.ndarray,
+        infos: List[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Add a batch of transitions to the buffer.
+        Each field is written with a single indexing operation
+        instead of calling ``add()`` for each transition.
+
+        :param obs: Observations, the first dimension is the batch dimension
+        :param next_obs: Next observations
+        :param action: Actions
+        :param reward: Rewards
+        :param done: Done signals
+        :param infos: The ``infos`` of each transition (one list of ``n_envs`` dicts per transition)
+        """
+        n_transitions = len(reward)
+        batch_shape = (n_transitions, self.n_envs)
+        # When the batch is larger than the buffer, only its last ``buffer_size`` transitions are kept
+        # (as when calling ``add()`` for each transition), so the indices below are unique
+        start = max(n_transitions - self.buffer_size, 0)
+        # Indices of the transitions in the circular buffer
+        indices = np.arange(self.pos + start, self.pos + n_transitions) % self.buffer_size
+
+        for key in self.observations.keys():
+            self.observations[key][indices] = np.reshape(obs[key], batch_shape + self.obs_shape[key])[start:]
+            self.next_observations[key][indices] = np.reshape(next_obs[key], batch_shape + self.obs_shape[key])[start:]
+
+        self.actions[indices] = np.reshape(action, batch_shape + (self.action_dim,))[start:]
+        self.rewards[indices] = np.reshape(reward, batch_shape)[start:]
+        self.dones[indices] = np.reshape(done, batch_shape)[start:]
+
+        if self.handle_timeout_termination:
+            self.timeouts[indices] = [[info.get("TimeLimit.truncated", False) for info in infos_] for infos_ in infos[start:]]
+
+        if self.pos + n_transitions >= self.buffer_size:
+            self.full = True
+        self.pos = (self.pos + n_transitions) % self.buffer_size
+
     def sample(self, batch_size: int, env: Optional[VecNormalize] = None) -> DictReplayBufferSamples:
         """
         Sample elements from the replay buffer.
@@ -583,23 +703,31 @@ class DictReplayBuffer(ReplayBuffer):
         return super(ReplayBuffer, self).sample(batch_size=batch_size, env=env)
 
     def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> DictReplayBufferSamples:
+        # Sample randomly the env idx
+        env_indices = self.np_random.integers(0, self.n_envs, size=(len(batch_inds),))
 
-        # Normalize if needed and remove extra dimension (we are using only one env for now)
-        obs_ = self._normalize_obs({key: obs[batch_inds, 0, :] for key, obs in self.observations.items()})
-        next_obs_ = self._normalize_obs({key: obs[batch_inds, 0, :] for key, obs in self.next_observations.items()})
+        # Normalize if needed and remove extra dimension
+        obs_ = self._normalize_obs({key: obs[batch_inds, env_indices, :] for key, obs in self.observations.items()})
+        next_obs_ = self._normalize_obs({key: obs[batch_inds, env_indices, :] for key, obs in self.next_observations.items()})
 
         # Convert to torch tensor
-        observations = {key: self.to_torch(obs) for key, obs in obs_.items()}
-        next_observations = {key: self.to_torch(obs) for key, obs in next_obs_.items()}
+        # (the sampled arrays are fresh copies from advanced indexing, no need to copy them again)
+        observations = {key: self.to_torch(obs, copy=False) for key, obs in obs_.items()}
+        next_observations = {key: self.to_torch(obs, copy=False) for key, obs in next_obs_.items()}
 
         return DictReplayBufferSamples(
             observations=observations,
-            actions=self.to_torch(self.actions[batch_inds]),
+            actions=self.to_torch(self.actions[batch_inds, env_indices], copy=False),
             next_observations=next_observations,
             # Only use dones that are not due to timeouts
             # deactivated by default (timeouts is initialized as an array of False)
-            dones=self.to_torch(self.dones[batch_inds] * (1 - self.timeouts[batch_inds])),
-            rewards=self.to_torch(self._normalize_reward(self.rewards[batch_inds], env)),
+            dones=self.to_torch(
+                (self.dones[batch_inds, env_indices] * (1 - self.timeouts[batch_inds, env_indices])).reshape(-1, 1),
+                copy=False,
+            ),
+            rewards=self.to_torch(
+                self._normalize_reward(self.rewards[batch_inds, env_indices].reshape(-1, 1), env), copy=False
+            ),
         )
 
 
@@ -652,17 +780,20 @@ class DictRolloutBuffer(RolloutBuffer):
 
     def reset(self) -> None:
         assert isinstance(self.obs_shape, dict), "DictRolloutBuffer must be used with Dict obs space only"
+        scalar_shape = (self.buffer_size, self.n_envs)
+        previous_observations = self.observations if self.observations is not None else {}
         self.observations = {}
         for key, obs_input_shape in self.obs_shape.items():
-            self.observations[key] = np.zeros((self.buffer_size, self.n_envs) + obs_input_shape, dtype=np.float32)
-        self.actions = np.zeros((self.buffer_size, self.n_envs, self.action_dim), dtype=np.float32)
-        self.rewards = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.returns = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.episode_starts = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.values = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.log_probs = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
-        self.advantages = np.zeros((self.buffer_size, self.n_envs), dtype=np.float32)
+            self.observations[key] = self._reset_array(previous_observations.get(key), scalar_shape + obs_input_shape)
+        self.actions = self._reset_array(self.actions, scalar_shape + (self.action_dim,))
+        self.rewards = self._reset_array(self.rewards, scalar_shape)
+        self.returns = self._reset_array(self.returns, scalar_shape)
+        self.episode_starts = self._reset_array(self.episode_starts, scalar_shape)
+        self.values = self._reset_array(self.values, scalar_shape)
+        self.log_probs = self._reset_array(self.log_probs, scalar_shape)
+        self.advantages = self._reset_array(self.advantages, scalar_shape)
         self.generator_ready = False
+        self._device_data = None
         super(RolloutBuffer, self).reset()
 
     def add(
@@ -689,25 +820,25 @@ class DictRolloutBuffer(RolloutBuffer):
             log_prob = log_prob.reshape(-1, 1)
 
         for key in self.observations.keys():
-            obs_ = np.array(obs[key]).copy()
+            obs_ = np.asarray(obs[key])
             # Reshape needed when using multiple envs with discrete observations
             # as numpy cannot broadcast (n_discrete,) to (n_discrete, 1)
             if isinstance(self.observation_space.spaces[key], spaces.Discrete):
                 obs_ = obs_.reshape((self.n_envs,) + self.obs_shape[key])
             self.observations[key][self.pos] = obs_
 
-        self.actions[self.pos] = np.array(action).copy()
-        self.rewards[self.pos] = np.array(reward).copy()
-        self.episode_starts[self.pos] = np.array(episode_start).copy()
-        self.values[self.pos] = value.clone().cpu().numpy().flatten()
-        self.log_probs[self.pos] = log_prob.clone().cpu().numpy()
+        self.actions[self.pos] = np.asarray(action)
+        self.rewards[self.pos] = np.asarray(reward)
+        self.episode_starts[self.pos] = np.asarray(episode_start)
+        self.values[self.pos] = value.detach().cpu().numpy().flatten()
+        self.log_probs[self.pos] = log_prob.detach().cpu().numpy()
         self.pos += 1
         if self.pos == self.buffer_size:
             self.full = True
 
     def get(self, batch_size: Optional[int] = None) -> Generator[DictRolloutBufferSamples, None, None]:
         assert self.full, ""
-        indices = np.random.permutation(self.buffer_size * self.n_envs)
+        indices = self.np_random.permutation(self.buffer_size * self.n_envs)
         # Prepare the data
         if not self.generator_ready:
 
@@ -718,8 +849,17 @@ class DictRolloutBuffer(RolloutBuffer):
 
             for tensor in _tensor_names:
                 self.__dict__[tensor] = self.swap_and_flatten(self.__dict__[tensor])
+            # Send the whole rollout to the device at once,
+            # the minibatches are then gathered directly on the device
+            self._device_data = {tensor: self.to_torch(self.__dict__[tensor], copy=False) for tensor in _tensor_names}
+            self._device_data["observations"] = {
+                key: self.to_torch(obs, copy=False) for (key, obs) in self.observations.items()
+            }
             self.generator_ready = True
 
+        # Send the permutation to the device once, the minibatch indices are slices of it
+        indices = th.as_tensor(indices, device=self.device)
+
         # Return everything, don't create minibatches
         if batch_size is None:
             batch_size = self.buffer_size * self.n_envs
@@ -729,13 +869,12 @@ class DictRolloutBuffer(RolloutBuffer):
             yield self._get_samples(indices[start_idx : start_idx + batch_size])
             start_idx += batch_size
 
-    def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> DictRolloutBufferSamples:
-
+    def _get_samples(self, batch_inds: th.Tensor, env: Optional[VecNormalize] = None) -> DictRolloutBufferSamples:
         return DictRolloutBufferSamples(
-            observations={key: self.to_torch(obs[batch_inds]) for (key, obs) in self.observations.items()},
-            actions=self.to_torch(self.actions[batch_inds]),
-            old_values=self.to_torch(self.values[batch_inds].flatten()),
-            old_log_prob=self.to_torch(self.log_probs[batch_inds].flatten()),
-            advantages=self.to_torch(self.advantages[batch_inds].flatten()),
-            returns=self.to_torch(self.returns[batch_inds].flatten()),
+            observations={key: obs[batch_inds] for (key, obs) in self._device_data["observations"].items()},
+            actions=self._device_data["actions"][batch_inds],
+            old_values=self._device_data["values"][batch_inds].flatten(),
+            old_log_prob=self._device_data["log_probs"][batch_inds].flatten(),
+            advantages=self._device_data["advantages"][batch_inds].flatten(),
+            returns=self._device_data["returns"][batch_inds].flatten(),
         )
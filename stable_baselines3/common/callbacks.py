@@ -508,9 +508,9 @@ class StopTrainingOnMaxEpisodes(BaseCallback):
 
     def _on_step(self) -> bool:
         # Checking for both 'done' and 'dones' keywords because:
-        # Some models use keyword 'done' (e.g.,: SAC, TD3, DQN, DDPG)
-        # While some models use keyword 'dones' (e.g.,: A2C, PPO)
-        done_array = np.array(self.locals.get("done") if self.locals.get("done") is not None else self.locals.get("dones"))
+        # The built-in models use keyword 'dones' (e.g.,: A2C, PPO, SAC, TD3, DQN, DDPG)
+        # While custom models may use keyword 'done'
+        done_array = np.array(self.locals.get("dones") if self.locals.get("dones") is not None else self.locals.get("done"))
         self.n_episodes += np.sum(done_array).item()
 
         continue_training = self.n_episodes < self._total_max_episodes
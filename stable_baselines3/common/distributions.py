@@ -112,6 +112,21 @@ def sum_independent_dims(tensor: th.Tensor) -> th.Tensor:
     return tensor
 
 
+@th.jit.script
+def squash_correction(actions: th.Tensor, epsilon: float) -> th.Tensor:
+    """
+    Squash correction of the log likelihood (from original SAC implementation),
+    this comes from the fact that tanh is bijective and differentiable.
+    It is scripted so the element-wise operations are executed as one graph
+    instead of dispatching each operation from Python.
+
+    :param actions: squashed actions, shape: (n_batch, n_actions)
+    :param epsilon: small value to avoid NaN due to numerical imprecision.
+    :return: shape: (n_batch,)
+    """
+    return th.sum(th.log(1 - actions ** 2 + epsilon), dim=1)
+
+
 class DiagGaussianDistribution(Distribution):
     """
     Gaussian distribution with diagonal covariance matrix, for continuous actions.
@@ -221,8 +236,7 @@ class SquashedDiagGaussianDistribution(DiagGaussianDistribution):
         # Log likelihood for a Gaussian distribution
         log_prob = super(SquashedDiagGaussianDistribution, self).log_prob(gaussian_actions)
         # Squash correction (from original SAC implementation)
-        # this comes from the fact that tanh is bijective and differentiable
-        log_prob -= th.sum(th.log(1 - actions ** 2 + self.epsilon), dim=1)
+        log_prob -= squash_correction(actions, self.epsilon)
         return log_prob
 
     def entropy(self) -> Optional[th.Tensor]:
@@ -474,7 +488,8 @@ class StateDependentNoiseDistribution(Distribution):
         if self.full_std:
             return std
         # Reduce the number of parameters:
-        return th.ones(self.latent_sde_dim, self.action_dim).to(log_std.device) * std
+        # (allocate directly on the right device to avoid a host to device copy at every call)
+        return th.ones(self.latent_sde_dim, self.action_dim, device=log_std.device) * std
 
     def sample_weights(self, log_std: th.Tensor, batch_size: int = 1) -> None:
         """
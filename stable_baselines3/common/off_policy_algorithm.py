@@ -1,7 +1,9 @@
 import io
 import pathlib
+import sys
 import time
 import warnings
+from copy import deepcopy
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import gym
@@ -11,11 +13,11 @@ import torch as th
 from stable_baselines3.common.base_class import BaseAlgorithm
 from stable_baselines3.common.buffers import DictReplayBuffer, ReplayBuffer
 from stable_baselines3.common.callbacks import BaseCallback
-from stable_baselines3.common.noise import ActionNoise
+from stable_baselines3.common.noise import ActionNoise, VectorizedActionNoise
 from stable_baselines3.common.policies import BasePolicy
 from stable_baselines3.common.save_util import load_from_pkl, save_to_pkl
 from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, RolloutReturn, Schedule, TrainFreq, TrainFrequencyUnit
-from stable_baselines3.common.utils import safe_mean, should_collect_more_steps
+from stable_baselines3.common.utils import safe_mean
 from stable_baselines3.common.vec_env import VecEnv
 from stable_baselines3.her.her_replay_buffer import HerReplayBuffer
 
@@ -151,6 +153,12 @@ class OffPolicyAlgorithm(BaseAlgorithm):
             self.policy_kwargs["use_sde"] = self.use_sde
         # For gSDE only
         self.use_sde_at_warmup = use_sde_at_warmup
+        # Random actions for the warm up phase, pre-sampled by chunks (continuous actions only)
+        self._warmup_actions = None  # type: Optional[np.ndarray]
+        self._warmup_action_idx = 0
+
+    def _excluded_save_params(self) -> List[str]:
+        return super(OffPolicyAlgorithm, self)._excluded_save_params() + ["_warmup_actions"]
 
     def _convert_train_freq(self) -> None:
         """
@@ -187,6 +195,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
 
         elif self.replay_buffer_class == HerReplayBuffer:
             assert self.env is not None, "You must pass an environment when using `HerReplayBuffer`"
+            assert self.n_envs == 1, "`HerReplayBuffer` only supports a single environment"
 
             # If using offline sampling, we need a classic replay buffer too
             if self.replay_buffer_kwargs.get("online_sampling", True):
@@ -214,6 +223,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
                 self.observation_space,
                 self.action_space,
                 self.device,
+                n_envs=self.n_envs,
                 optimize_memory_usage=self.optimize_memory_usage,
                 **self.replay_buffer_kwargs,
             )
@@ -239,6 +249,11 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         assert self.replay_buffer is not None, "The replay buffer is not defined"
         save_to_pkl(path, self.replay_buffer, self.verbose)
 
+    def set_random_seed(self, seed: Optional[int] = None) -> None:
+        super(OffPolicyAlgorithm, self).set_random_seed(seed)
+        if seed is not None and self.replay_buffer is not None:
+            self.replay_buffer.seed(seed)
+
     def load_replay_buffer(
         self,
         path: Union[str, pathlib.Path, io.BufferedIOBase],
@@ -255,6 +270,9 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         """
         self.replay_buffer = load_from_pkl(path, self.verbose)
         assert isinstance(self.replay_buffer, ReplayBuffer), "The replay buffer must inherit from ReplayBuffer class"
+        # Do not continue the pickled random stream: seed the sampling from the global numpy RNG
+        # (seeded by ``set_random_seed()``), as when the buffer is created
+        self.replay_buffer.seed()
 
         # Backward compatibility with SB3 < 2.1.0 replay buffer
         # Keep old behavior: do not handle timeout termination separately
@@ -311,6 +329,15 @@ class OffPolicyAlgorithm(BaseAlgorithm):
             pos = (replay_buffer.pos - 1) % replay_buffer.buffer_size
             replay_buffer.dones[pos] = True
 
+        # Vectorize action noise if needed
+        if (
+            self.action_noise is not None
+            and self.env is not None
+            and self.env.num_envs > 1
+            and not isinstance(self.action_noise, VectorizedActionNoise)
+        ):
+            self.action_noise = VectorizedActionNoise(self.action_noise, self.env.num_envs)
+
         return super()._setup_learn(
             total_timesteps,
             eval_env,
@@ -379,8 +406,43 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         """
         raise NotImplementedError()
 
+    def _sample_warmup_action(self, learning_starts: int, n_envs: int = 1) -> np.ndarray:
+        """
+        Sample random actions for the warm up phase.
+        For bounded continuous action spaces, the actions are drawn by chunks
+        (one chunk for all the remaining warm up steps, up to 4096 actions)
+        to avoid calling ``action_space.sample()`` at every step.
+
+        :param learning_starts: Number of steps before learning for the warm-up phase.
+        :param n_envs: Number of environments (one action is sampled per env)
+        :return: A batch containing one random (unscaled) action per env
+        """
+        if not (
+            isinstance(self.action_space, gym.spaces.Box)
+            and self.action_space.is_bounded()
+            and np.issubdtype(self.action_space.dtype, np.floating)
+        ):
+            return np.array([self.action_space.sample() for _ in range(n_envs)])
+
+        if self._warmup_actions is None or self._warmup_action_idx + n_envs > len(self._warmup_actions):
+            n_actions = max(int(np.clip(learning_starts - self.num_timesteps, 1, 4096)), n_envs)
+            # Same distribution as `Box.sample()` for bounded spaces
+            self._warmup_actions = self.action_space.np_random.uniform(
+                low=self.action_space.low,
+                high=self.action_space.high,
+                size=(n_actions,) + self.action_space.shape,
+            ).astype(self.action_space.dtype)
+            self._warmup_action_idx = 0
+
+        action = self._warmup_actions[self._warmup_action_idx : self._warmup_action_idx + n_envs]
+        self._warmup_action_idx += n_envs
+        return action
+
     def _sample_action(
-        self, learning_starts: int, action_noise: Optional[ActionNoise] = None
+        self,
+        learning_starts: int,
+        action_noise: Optional[ActionNoise] = None,
+        n_envs: int = 1,
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Sample an action according to the exploration policy.
@@ -392,6 +454,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
             Required for deterministic policy (e.g. TD3). This can also be used
             in addition to the stochastic policy for SAC.
         :param learning_starts: Number of steps before learning for the warm-up phase.
+        :param n_envs: Number of environments (one action is sampled per env)
         :return: action to take in the environment
             and scaled action that will be stored in the replay buffer.
             The two differs when the action space is not normalized (bounds are not [-1, 1]).
@@ -399,7 +462,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         # Select action randomly or according to policy
         if self.num_timesteps < learning_starts and not (self.use_sde and self.use_sde_at_warmup):
             # Warmup phase
-            unscaled_action = np.array([self.action_space.sample()])
+            unscaled_action = self._sample_warmup_action(learning_starts, n_envs)
         else:
             # Note: when using continuous actions,
             # we assume that the policy uses tanh to scale the action
@@ -458,7 +521,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         buffer_action: np.ndarray,
         new_obs: np.ndarray,
         reward: np.ndarray,
-        done: np.ndarray,
+        dones: np.ndarray,
         infos: List[Dict[str, Any]],
     ) -> None:
         """
@@ -471,7 +534,7 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         :param new_obs: next observation in the current episode
             or first observation of the episode (when done is True)
         :param reward: reward for the current transition
-        :param done: Termination signal
+        :param dones: Termination signals
         :param infos: List of additional information about the transition.
             It may contain the terminal observations and information about timeout.
         """
@@ -485,20 +548,29 @@ class OffPolicyAlgorithm(BaseAlgorithm):
 
         # As the VecEnv resets automatically, new_obs is already the
         # first observation of the next episode
-        if done and infos[0].get("terminal_observation") is not None:
-            next_obs = infos[0]["terminal_observation"]
-            # VecNormalize normalizes the terminal observation
-            if self._vec_normalize_env is not None:
-                next_obs = self._vec_normalize_env.unnormalize_obs(next_obs)
-        else:
-            next_obs = new_obs_
+        next_obs = new_obs_
+        # Only the envs that finished an episode have a terminal observation
+        for i in np.flatnonzero(dones):
+            if infos[i].get("terminal_observation") is not None:
+                if next_obs is new_obs_:
+                    # Avoid modification by reference of the observation of the next step
+                    next_obs = deepcopy(new_obs_)
+                terminal_obs = infos[i]["terminal_observation"]
+                # VecNormalize normalizes the terminal observation
+                if self._vec_normalize_env is not None:
+                    terminal_obs = self._vec_normalize_env.unnormalize_obs(terminal_obs)
+                if isinstance(next_obs, dict):
+                    for key in next_obs.keys():
+                        next_obs[key][i] = terminal_obs[key]
+                else:
+                    next_obs[i] = terminal_obs
 
         replay_buffer.add(
             self._last_original_obs,
             next_obs,
             buffer_action,
             reward_,
-            done,
+            dones,
             infos,
         )
 
@@ -536,79 +608,92 @@ class OffPolicyAlgorithm(BaseAlgorithm):
         :param log_interval: Log data every ``log_interval`` episodes
         :return:
         """
-        episode_rewards, total_timesteps = [], []
-        num_collected_steps, num_collected_episodes = 0, 0
-
         assert isinstance(env, VecEnv), "You must pass a VecEnv"
-        assert env.num_envs == 1, "OffPolicyAlgorithm only support single environment"
         assert train_freq.frequency > 0, "Should at least collect one step or episode."
 
+        # Bound once, it is used several times at every step
+        n_envs = env.num_envs
+        num_collected_steps, num_collected_episodes = 0, 0
+        # Sum of the rewards of the finished episodes, to compute their mean online
+        episode_rewards_sum = 0.0
+        # Reward and length of the current episode of each env
+        # (the length is not used here, it is kept for the callbacks that read it in ``self.locals``)
+        episode_reward = np.zeros(n_envs)
+        episode_timesteps = np.zeros(n_envs, dtype=np.int64)
+
+        if n_envs > 1:
+            assert train_freq.unit == TrainFrequencyUnit.STEP, "You must use only one env when doing episodic training."
+
+        # Only one of the two budgets applies: resolve them once
+        # so the termination condition checked at every step is a plain integer comparison
+        # (``sys.maxsize`` rather than ``np.inf`` for the budget that does not apply, to stay with integers)
+        max_collected_steps = train_freq.frequency if train_freq.unit == TrainFrequencyUnit.STEP else sys.maxsize
+        max_collected_episodes = train_freq.frequency if train_freq.unit == TrainFrequencyUnit.EPISODE else sys.maxsize
+
         if self.use_sde:
-            self.actor.reset_noise()
+            self.actor.reset_noise(n_envs)
+        resample_sde_noise = self.use_sde and self.sde_sample_freq > 0
 
         callback.on_rollout_start()
+        update_locals = self._callback_reads_locals(callback)
         continue_training = True
 
-        while should_collect_more_steps(train_freq, num_collected_steps, num_collected_episodes):
-            done = False
-            episode_reward, episode_timesteps = 0.0, 0
-
-            while not done:
+        while num_collected_steps < max_collected_steps and num_collected_episodes < max_collected_episodes:
+            if resample_sde_noise and num_collected_steps % self.sde_sample_freq == 0:
+                # Sample a new noise matrix
+                self.actor.reset_noise(n_envs)
 
-                if self.use_sde and self.sde_sample_freq > 0 and num_collected_steps % self.sde_sample_freq == 0:
-                    # Sample a new noise matrix
-                    self.actor.reset_noise()
+            # Select action randomly or according to policy
+            actions, buffer_actions = self._sample_action(learning_starts, action_noise, n_envs)
 
-                # Select action randomly or according to policy
-                action, buffer_action = self._sample_action(learning_starts, action_noise)
+            # Rescale and perform action
+            new_obs, rewards, dones, infos = env.step(actions)
 
-                # Rescale and perform action
-                new_obs, reward, done, infos = env.step(action)
+            self.num_timesteps += n_envs
+            episode_timesteps += 1
+            num_collected_steps += 1
 
-                self.num_timesteps += 1
-                episode_timesteps += 1
-                num_collected_steps += 1
-
-                # Give access to local variables
+            # Give access to local variables
+            if update_locals:
                 callback.update_locals(locals())
-                # Only stop training if return value is False, not when it is None.
-                if callback.on_step() is False:
-                    return RolloutReturn(0.0, num_collected_steps, num_collected_episodes, continue_training=False)
-
-                episode_reward += reward
+            # Only stop training if return value is False, not when it is None.
+            if callback.on_step() is False:
+                return RolloutReturn(0.0, num_collected_steps * n_envs, num_collected_episodes, continue_training=False)
 
-                # Retrieve reward and episode length if using Monitor wrapper
-                self._update_info_buffer(infos, done)
+            episode_reward += rewards
 
-                # Store data in replay buffer (normalized action and unnormalized observation)
-                self._store_transition(replay_buffer, buffer_action, new_obs, reward, done, infos)
+            # Retrieve reward and episode length if using Monitor wrapper
+            self._update_info_buffer(infos, dones)
 
-                self._update_current_progress_remaining(self.num_timesteps, self._total_timesteps)
+            # Store data in replay buffer (normalized action and unnormalized observation)
+            self._store_transition(replay_buffer, buffer_actions, new_obs, rewards, dones, infos)
 
-                # For DQN, check if the target network should be updated
-                # and update the exploration schedule
-                # For SAC/TD3, the update is done as the same time as the gradient update
-                # see https://github.com/hill-a/stable-baselines/issues/900
-                self._on_step()
+            self._update_current_progress_remaining(self.num_timesteps, self._total_timesteps)
 
-                if not should_collect_more_steps(train_freq, num_collected_steps, num_collected_episodes):
-                    break
+            # For DQN, check if the target network should be updated
+            # and update the exploration schedule
+            # For SAC/TD3, the update is done as the same time as the gradient update
+            # see https://github.com/hill-a/stable-baselines/issues/900
+            self._on_step()
 
-            if done:
+            # Envs that finished an episode
+            for idx in np.flatnonzero(dones):
+                # Update stats
                 num_collected_episodes += 1
                 self._episode_num += 1
-                episode_rewards.append(episode_reward)
-                total_timesteps.append(episode_timesteps)
+                episode_rewards_sum += episode_reward[idx]
+                episode_reward[idx], episode_timesteps[idx] = 0.0, 0
 
                 if action_noise is not None:
-                    action_noise.reset()
+                    kwargs = dict(indices=[idx]) if n_envs > 1 else {}
+                    action_noise.reset(**kwargs)
 
                 # Log training infos
                 if log_interval is not None and self._episode_num % log_interval == 0:
                     self._dump_logs()
 
-        mean_reward = np.mean(episode_rewards) if num_collected_episodes > 0 else 0.0
+        mean_reward = episode_rewards_sum / num_collected_episodes if num_collected_episodes > 0 else 0.0
 
         callback.on_rollout_end()
 
-        return RolloutReturn(mean_reward, num_collected_steps, num_collected_episodes, continue_training)
+        return RolloutReturn(mean_reward, num_collected_steps * n_envs, num_collected_episodes, continue_training)
@@ -10,7 +10,7 @@ from stable_baselines3.common.buffers import DictRolloutBuffer, RolloutBuffer
 from stable_baselines3.common.callbacks import BaseCallback
 from stable_baselines3.common.policies import ActorCriticPolicy, BasePolicy
 from stable_baselines3.common.type_aliases import GymEnv, MaybeCallback, Schedule
-from stable_baselines3.common.utils import obs_as_tensor, safe_mean
+from stable_baselines3.common.utils import inference_mode, obs_as_tensor, safe_mean
 from stable_baselines3.common.vec_env import VecEnv
 
 
@@ -126,6 +126,11 @@ class OnPolicyAlgorithm(BaseAlgorithm):
         )
         self.policy = self.policy.to(self.device)
 
+    def set_random_seed(self, seed: Optional[int] = None) -> None:
+        super(OnPolicyAlgorithm, self).set_random_seed(seed)
+        if seed is not None and self.rollout_buffer is not None:
+            self.rollout_buffer.seed(seed)
+
     def collect_rollouts(
         self,
         env: VecEnv,
@@ -152,15 +157,17 @@ class OnPolicyAlgorithm(BaseAlgorithm):
         # Sample new weights for the state dependent exploration
         if self.use_sde:
             self.policy.reset_noise(env.num_envs)
+        resample_sde_noise = self.use_sde and self.sde_sample_freq > 0
 
         callback.on_rollout_start()
+        update_locals = self._callback_reads_locals(callback)
 
         while n_steps < n_rollout_steps:
-            if self.use_sde and self.sde_sample_freq > 0 and n_steps % self.sde_sample_freq == 0:
+            if resample_sde_noise and n_steps % self.sde_sample_freq == 0:
                 # Sample a new noise matrix
                 self.policy.reset_noise(env.num_envs)
 
-            with th.no_grad():
+            with inference_mode():
                 # Convert to pytorch tensor or to TensorDict
                 obs_tensor = obs_as_tensor(self._last_obs, self.device)
                 actions, values, log_probs = self.policy.forward(obs_tensor)
@@ -177,11 +184,12 @@ class OnPolicyAlgorithm(BaseAlgorithm):
             self.num_timesteps += env.num_envs
 
             # Give access to local variables
-            callback.update_locals(locals())
+            if update_locals:
+                callback.update_locals(locals())
             if callback.on_step() is False:
                 return False
 
-            self._update_info_buffer(infos)
+            self._update_info_buffer(infos, dones)
             n_steps += 1
 
             if isinstance(self.action_space, gym.spaces.Discrete):
@@ -191,10 +199,10 @@ class OnPolicyAlgorithm(BaseAlgorithm):
             self._last_obs = new_obs
             self._last_episode_starts = dones
 
-        with th.no_grad():
+        with inference_mode():
             # Compute value for the last timestep
             obs_tensor = obs_as_tensor(new_obs, self.device)
-            _, values, _ = self.policy.forward(obs_tensor)
+            values = self.policy.predict_values(obs_tensor)
 
         rollout_buffer.compute_returns_and_advantage(last_values=values, dones=dones)
 
@@ -1,7 +1,6 @@
 """Policies: abstract base class and concrete implementations."""
 
 import collections
-import copy
 from abc import ABC, abstractmethod
 from functools import partial
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
@@ -30,7 +29,7 @@ from stable_baselines3.common.torch_layers import (
     create_mlp,
 )
 from stable_baselines3.common.type_aliases import Schedule
-from stable_baselines3.common.utils import get_device, is_vectorized_observation, obs_as_tensor
+from stable_baselines3.common.utils import get_device, inference_mode, is_vectorized_observation, obs_as_tensor
 
 
 class BaseModel(nn.Module, ABC):
@@ -271,13 +270,14 @@ class BasePolicy(BaseModel):
         vectorized_env = False
         if isinstance(observation, dict):
             # need to copy the dict as the dict in VecFrameStack will become a torch tensor
-            observation = copy.deepcopy(observation)
+            # (a shallow copy is enough: only the values are replaced, the arrays are not modified)
+            observation = dict(observation)
             for key, obs in observation.items():
                 obs_space = self.observation_space.spaces[key]
                 if is_image_space(obs_space):
                     obs_ = maybe_transpose(obs, obs_space)
                 else:
-                    obs_ = np.array(obs)
+                    obs_ = np.asarray(obs)
                 vectorized_env = vectorized_env or is_vectorized_observation(obs_, obs_space)
                 # Add batch dimension if needed
                 observation[key] = obs_.reshape((-1,) + self.observation_space[key].shape)
@@ -288,7 +288,8 @@ class BasePolicy(BaseModel):
             observation = maybe_transpose(observation, self.observation_space)
 
         else:
-            observation = np.array(observation)
+            # No copy needed: the observation is only read
+            observation = np.asarray(observation)
 
         if not isinstance(observation, dict):
             # Dict obs need to be handled separately
@@ -296,9 +297,11 @@ class BasePolicy(BaseModel):
             # Add batch dimension if needed
             observation = observation.reshape((-1,) + self.observation_space.shape)
 
+        # On CPU, the tensor may share its memory with the observation of the caller:
+        # the preprocessing and the networks must never modify it in place
         observation = obs_as_tensor(observation, self.device)
 
-        with th.no_grad():
+        with inference_mode():
             actions = self._predict(observation, deterministic=deterministic)
         # Convert to numpy
         actions = actions.cpu().numpy()
@@ -641,6 +644,18 @@ class ActorCriticPolicy(BasePolicy):
         values = self.value_net(latent_vf)
         return values, log_prob, distribution.entropy()
 
+    def predict_values(self, obs: th.Tensor) -> th.Tensor:
+        """
+        Get the estimated values according to the current policy given the observations.
+        Contrary to ``forward()``, the action distribution is not computed.
+
+        :param obs:
+        :return: the estimated values.
+        """
+        features = self.extract_features(obs)
+        _, latent_vf = self.mlp_extractor(features)
+        return self.value_net(latent_vf)
+
 
 class ActorCriticCnnPolicy(ActorCriticPolicy):
     """
@@ -3,7 +3,7 @@ import os
 import random
 from collections import deque
 from itertools import zip_longest
-from typing import Dict, Iterable, Optional, Union
+from typing import ContextManager, Dict, Iterable, Optional, Union
 
 import gym
 import numpy as np
@@ -401,9 +401,9 @@ def polyak_update(
     ``tau``, the soft update coefficient controls the interpolation:
     ``tau=1`` corresponds to copying the parameters to the target ones whereas nothing happens when ``tau=0``.
     The Polyak update is done in place, with ``no_grad``, and therefore does not create intermediate tensors,
-    or a computation graph, reducing memory cost and improving performance.  We scale the target params
-    by ``1-tau`` (in-place), add the new weights, scaled by ``tau`` and store the result of the sum in the target
-    params (in place).
+    or a computation graph, reducing memory cost and improving performance.  The target params are linearly
+    interpolated towards the new weights (in place) using ``lerp_``, which performs the scaling and the sum
+    in a single fused kernel per parameter (``target + tau * (param - target)``).
     See https://github.com/DLR-RM/stable-baselines3/issues/93
 
     :param params: parameters to use to update the target params
@@ -413,28 +413,61 @@ def polyak_update(
     with th.no_grad():
         # zip does not raise an exception if length of parameters does not match.
         for param, target_param in zip_strict(params, target_params):
-            target_param.data.mul_(1 - tau)
-            th.add(target_param.data, param.data, alpha=tau, out=target_param.data)
+            target_param.data.lerp_(param.data, tau)
+
+
+def inference_mode() -> ContextManager:
+    """
+    Context manager for forward passes whose outputs are never used to compute gradients
+    (e.g. when collecting rollouts or predicting actions).
+    It uses ``th.inference_mode()`` when available (PyTorch >= 1.9), which skips the autograd bookkeeping
+    (version counters, view tracking), and falls back to ``th.no_grad()`` otherwise.
+
+    :return: the context manager
+    """
+    if hasattr(th, "inference_mode"):
+        return th.inference_mode()
+    return th.no_grad()
 
 
 def obs_as_tensor(
     obs: Union[np.ndarray, Dict[Union[str, int], np.ndarray]], device: th.device
 ) -> Union[th.Tensor, TensorDict]:
     """
-    Moves the observation to the given device.
+    Moves the observation to the given device (see ``array_to_device()``).
 
     :param obs:
     :param device: PyTorch device
     :return: PyTorch tensor of the observation on a desired device.
     """
     if isinstance(obs, np.ndarray):
-        return th.as_tensor(obs).to(device)
+        return array_to_device(obs, device)
     elif isinstance(obs, dict):
-        return {key: th.as_tensor(_obs).to(device) for (key, _obs) in obs.items()}
+        return {key: array_to_device(_obs, device) for (key, _obs) in obs.items()}
     else:
         raise Exception(f"Unrecognized type of observation {type(obs)}")
 
 
+def array_to_device(array: np.ndarray, device: Union[th.device, str], copy: bool = False) -> th.Tensor:
+    """
+    Convert a numpy array to a PyTorch tensor on the given device.
+    When using a GPU, the data is copied to page-locked (pinned) memory
+    so the transfer to the device can be done asynchronously.
+
+    :param array:
+    :param device: PyTorch device
+    :param copy: Whether to copy the data when the device is the CPU
+        (otherwise the tensor shares the memory of the array)
+    :return:
+    """
+    if th.device(device).type == "cuda":
+        # The transfer to the device already copies the data
+        return th.as_tensor(array).pin_memory().to(device, non_blocking=True)
+    if copy:
+        return th.tensor(array).to(device)
+    return th.as_tensor(array).to(device)
+
+
 def should_collect_more_steps(
     train_freq: TrainFreq,
     num_collected_steps: int,
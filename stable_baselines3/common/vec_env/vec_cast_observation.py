@@ -0,0 +1,54 @@
+from typing import Dict, Union
+
+import numpy as np
+from gym import spaces
+
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv, VecEnvObs, VecEnvStepReturn, VecEnvWrapper
+
+
+class VecCastObservation(VecEnvWrapper):
+    """
+    Cast the floating point observations (e.g. ``float64`` observations of MuJoCo envs)
+    and the rewards to ``float32`` once at the env boundary.
+    The observations can then be converted to PyTorch tensors without copy
+    and the buffers store them with half the memory.
+
+    :param venv: The vectorized environment
+    """
+
+    def __init__(self, venv: VecEnv):
+        observation_space = self._cast_space(venv.observation_space)
+        super(VecCastObservation, self).__init__(venv, observation_space=observation_space)
+
+    @staticmethod
+    def _cast_space(space: spaces.Space) -> spaces.Space:
+        """
+        Cast the floating point ``Box`` spaces to ``float32``, the other spaces are left untouched.
+
+        :param space:
+        :return:
+        """
+        if isinstance(space, spaces.Dict):
+            return spaces.Dict({key: VecCastObservation._cast_space(subspace) for key, subspace in space.spaces.items()})
+        if isinstance(space, spaces.Box) and np.issubdtype(space.dtype, np.floating):
+            return spaces.Box(low=space.low.astype(np.float32), high=space.high.astype(np.float32), dtype=np.float32)
+        return space
+
+    def _cast_obs(self, obs: VecEnvObs) -> Union[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        :param obs:
+        :return: The observation, with the dtype of ``self.observation_space``
+        """
+        if isinstance(obs, dict):
+            return {key: np.asarray(_obs, dtype=self.observation_space.spaces[key].dtype) for key, _obs in obs.items()}
+        return np.asarray(obs, dtype=self.observation_space.dtype)
+
+    def reset(self) -> VecEnvObs:
+        return self._cast_obs(self.venv.reset())
+
+    def step_wait(self) -> VecEnvStepReturn:
+        obs, rewards, dones, infos = self.venv.step_wait()
+        for idx in np.flatnonzero(dones):
+            if infos[idx].get("terminal_observation") is not None:
+                infos[idx]["terminal_observation"] = self._cast_obs(infos[idx]["terminal_observation"])
+        return self._cast_obs(obs), np.asarray(rewards, dtype=np.float32), dones, infos
@@ -1,3 +1,4 @@
+import warnings
 from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 import gym
@@ -111,6 +112,7 @@ class DQN(OffPolicyAlgorithm):
             sde_support=False,
             optimize_memory_usage=optimize_memory_usage,
             supported_action_spaces=(gym.spaces.Discrete,),
+            support_multi_env=True,
         )
 
         self.exploration_initial_eps = exploration_initial_eps
@@ -123,6 +125,8 @@ class DQN(OffPolicyAlgorithm):
         # Linear schedule will be defined in `_setup_model()`
         self.exploration_schedule = None
         self.q_net, self.q_net_target = None, None
+        # For updating the target network with multiple envs:
+        self._n_calls = 0
 
         if _init_setup_model:
             self._setup_model()
@@ -135,6 +139,13 @@ class DQN(OffPolicyAlgorithm):
             self.exploration_final_eps,
             self.exploration_fraction,
         )
+        if self.n_envs > self.target_update_interval:
+            warnings.warn(
+                "The number of environments used is greater than the target network "
+                f"update interval ({self.n_envs} > {self.target_update_interval}), "
+                "therefore the target network will be updated after each call to env.step() "
+                f"which corresponds to {self.n_envs} steps."
+            )
 
     def _create_aliases(self) -> None:
         self.q_net = self.policy.q_net
@@ -143,9 +154,13 @@ class DQN(OffPolicyAlgorithm):
     def _on_step(self) -> None:
         """
         Update the exploration rate and target network if needed.
-        This method is called in ``collect_rollouts()`` after each step in the environment.
+        This method is called in ``collect_rollouts()`` after each step in the environment,
+        once the progress remaining (used by the exploration schedule) has been updated.
         """
-        if self.num_timesteps % self.target_update_interval == 0:
+        self._n_calls += 1
+        # Account for multiple environments:
+        # each call to step() corresponds to n_envs transitions
+        if self._n_calls % max(self.target_update_interval // self.n_envs, 1) == 0:
             polyak_update(self.q_net.parameters(), self.q_net_target.parameters(), self.tau)
 
         self.exploration_rate = self.exploration_schedule(self._current_progress_remaining)
@@ -211,14 +226,17 @@ class DQN(OffPolicyAlgorithm):
             (used in recurrent policies)
         """
         if not deterministic and np.random.rand() < self.exploration_rate:
+            # The random actions are drawn from the global RNG (seeded by `set_random_seed()`),
+            # like the exploration test above, with or without a vectorized observation
             if is_vectorized_observation(maybe_transpose(observation, self.observation_space), self.observation_space):
                 if isinstance(self.observation_space, gym.spaces.Dict):
                     n_batch = observation[list(observation.keys())[0]].shape[0]
                 else:
                     n_batch = observation.shape[0]
-                action = np.array([self.action_space.sample() for _ in range(n_batch)])
+                # Sample the random actions of all envs with a single call to the RNG
+                action = np.random.randint(self.action_space.n, size=n_batch)
             else:
-                action = np.array(self.action_space.sample())
+                action = np.array(np.random.randint(self.action_space.n))
         else:
             action, state = self.policy.predict(observation, state, mask, deterministic)
         return action, state
@@ -5,10 +5,10 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 import torch as th
 
-from stable_baselines3.common.buffers import DictReplayBuffer
+from stable_baselines3.common.buffers import DictReplayBuffer, ReplayBuffer
 from stable_baselines3.common.preprocessing import get_obs_shape
 from stable_baselines3.common.type_aliases import DictReplayBufferSamples
-from stable_baselines3.common.vec_env import VecEnv, VecNormalize
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, VecNormalize
 from stable_baselines3.her.goal_selection_strategy import KEY_TO_GOAL_STRATEGY, GoalSelectionStrategy
 
 
@@ -55,6 +55,12 @@ class HerReplayBuffer(DictReplayBuffer):
     In the online sampling case, these new transitions will not be saved in the replay buffer
     and will only be created at sampling time.
 
+    .. note::
+
+      The storage of the ``DictReplayBuffer`` parent class is not allocated:
+      the ``observations``, ``next_observations``, ``actions``, ``rewards``, ``dones`` and ``timeouts``
+      attributes do not exist, the transitions are stored per episode instead.
+
     :param env: The training environment
     :param buffer_size: The size of the buffer measured in transitions.
     :param max_episode_length: The maximum length of an episode. If not specified,
@@ -82,7 +88,9 @@ class HerReplayBuffer(DictReplayBuffer):
         handle_timeout_termination: bool = True,
     ):
 
-        super(HerReplayBuffer, self).__init__(buffer_size, env.observation_space, env.action_space, device, env.num_envs)
+        # Skip the storage allocation of `DictReplayBuffer`:
+        # transitions are stored per episode in `self._buffer` (and in `self.replay_buffer` for offline sampling)
+        super(ReplayBuffer, self).__init__(buffer_size, env.observation_space, env.action_space, device, env.num_envs)
 
         # convert goal_selection_strategy into GoalSelectionStrategy if string
         if isinstance(goal_selection_strategy, str):
@@ -147,7 +155,9 @@ class HerReplayBuffer(DictReplayBuffer):
             for key, dim in input_shape.items()
         }
         # Store info dicts are it can be used to compute the reward (e.g. continuity cost)
-        self.info_buffer = [deque(maxlen=self.max_episode_length) for _ in range(self.max_episode_stored)]
+        # The storage of each episode is created lazily in `add()`, so the memory used
+        # grows with the number of episodes actually stored rather than with the buffer capacity
+        self.info_buffer = [None] * self.max_episode_stored  # type: List[Optional[deque]]
         # episode length storage, needed for episodes which has less steps than the maximum length
         self.episode_lengths = np.zeros(self.max_episode_stored, dtype=np.int64)
 
@@ -171,10 +181,25 @@ class HerReplayBuffer(DictReplayBuffer):
 
         :param state:
         """
-        self.__dict__.update(state)
+        super(HerReplayBuffer, self).__setstate__(state)
         assert "env" not in state
         self.env = None
 
+    def seed(self, seed: Optional[int] = None) -> None:
+        """
+        Seed the generators used to sample from the buffer
+        (including the one of the replay buffer used for offline sampling).
+
+        :param seed: If ``None``, the generators are seeded from the global numpy RNG
+        """
+        her_seed, replay_buffer_seed = None, None
+        if seed is not None:
+            # Derive one seed per generator, otherwise they would produce the same stream
+            her_seed, replay_buffer_seed = (int(seed_) for seed_ in np.random.SeedSequence(seed).generate_state(2))
+        super(HerReplayBuffer, self).seed(her_seed)
+        if self.replay_buffer is not None:
+            self.replay_buffer.seed(replay_buffer_seed)
+
     def set_env(self, env: VecEnv) -> None:
         """
         Sets the environment.
@@ -186,12 +211,59 @@ class HerReplayBuffer(DictReplayBuffer):
 
         self.env = env
 
+    def _compute_reward(self, achieved_goal: np.ndarray, desired_goal: np.ndarray, info: np.ndarray) -> np.ndarray:
+        """
+        Compute the rewards of a batch of transitions using the ``compute_reward()`` method of the env.
+        When the env lives in the main process (``DummyVecEnv`` with a single env),
+        the method is called directly instead of being dispatched through ``env_method()``.
+
+        :param achieved_goal: Achieved goals
+        :param desired_goal: Desired goals
+        :param info: Info dicts of the transitions
+        :return: The rewards
+        """
+        venv = self.env.unwrapped
+        if isinstance(venv, DummyVecEnv) and venv.num_envs == 1:
+            return venv.envs[0].compute_reward(achieved_goal, desired_goal, info)
+        return self.env.env_method("compute_reward", achieved_goal, desired_goal, info)
+
     def _get_samples(self, batch_inds: np.ndarray, env: Optional[VecNormalize] = None) -> DictReplayBufferSamples:
         """
         Abstract method from base class.
         """
         raise NotImplementedError()
 
+    def extend(
+        self,
+        obs: Dict[str, np.ndarray],
+        next_obs: Dict[str, np.ndarray],
+        action: np.ndarray,
+        reward: np.ndarray,
+        done: np.ndarray,
+        infos: List[List[Dict[str, Any]]],
+    ) -> None:
+        """
+        Add a batch of transitions to the buffer, one transition at a time
+        (``DictReplayBuffer.extend()`` writes directly to the storage of the parent class,
+        which is not allocated).
+
+        :param obs: Observations, the first dimension is the batch dimension
+        :param next_obs: Next observations
+        :param action: Actions
+        :param reward: Rewards
+        :param done: Done signals
+        :param infos: The ``infos`` of each transition (one list of ``n_envs`` dicts per transition)
+        """
+        for idx in range(len(reward)):
+            self.add(
+                {key: obs_[idx] for key, obs_ in obs.items()},
+                {key: next_obs_[idx] for key, next_obs_ in next_obs.items()},
+                action[idx],
+                reward[idx],
+                done[idx],
+                infos[idx],
+            )
+
     def sample(
         self,
         batch_size: int,
@@ -255,13 +327,13 @@ class HerReplayBuffer(DictReplayBuffer):
 
         elif self.goal_selection_strategy == GoalSelectionStrategy.FUTURE:
             # replay with random state which comes from the same episode and was observed after current transition
-            transitions_indices = np.random.randint(
+            transitions_indices = self.np_random.integers(
                 transitions_indices[her_indices] + 1, self.episode_lengths[her_episode_indices]
             )
 
         elif self.goal_selection_strategy == GoalSelectionStrategy.EPISODE:
             # replay with random state which comes from the same episode as current transition
-            transitions_indices = np.random.randint(self.episode_lengths[her_episode_indices])
+            transitions_indices = self.np_random.integers(self.episode_lengths[her_episode_indices])
 
         else:
             raise ValueError(f"Strategy {self.goal_selection_strategy} for sampling goals not supported!")
@@ -289,12 +361,12 @@ class HerReplayBuffer(DictReplayBuffer):
             # Do not sample the episode with index `self.pos` as the episode is invalid
             if self.full:
                 episode_indices = (
-                    np.random.randint(1, self.n_episodes_stored, batch_size) + self.pos
+                    self.np_random.integers(1, self.n_episodes_stored, batch_size) + self.pos
                 ) % self.n_episodes_stored
             else:
-                episode_indices = np.random.randint(0, self.n_episodes_stored, batch_size)
+                episode_indices = self.np_random.integers(0, self.n_episodes_stored, batch_size)
             # A subset of the transitions will be relabeled using HER algorithm
-            her_indices = np.arange(batch_size)[: int(self.her_ratio * batch_size)]
+            her_indices = np.arange(int(self.her_ratio * batch_size))
         else:
             assert maybe_vec_env is None, "Transitions must be stored unnormalized in the replay buffer"
             assert n_sampled_goal is not None, "No n_sampled_goal specified for offline sampling of HER transitions"
@@ -318,7 +390,7 @@ class HerReplayBuffer(DictReplayBuffer):
 
         if online_sampling:
             # Select which transitions to use
-            transitions_indices = np.random.randint(ep_lengths)
+            transitions_indices = self.np_random.integers(ep_lengths)
         else:
             if her_indices.size == 0:
                 # Episode of one timestep, not enough for using the "future" strategy
@@ -333,7 +405,8 @@ class HerReplayBuffer(DictReplayBuffer):
                 her_indices = np.arange(len(episode_indices))
 
         # get selected transitions
-        transitions = {key: self._buffer[key][episode_indices, transitions_indices].copy() for key in self._buffer.keys()}
+        # (advanced indexing already returns a copy, the episode storage is not modified by the relabeling)
+        transitions = {key: self._buffer[key][episode_indices, transitions_indices] for key in self._buffer.keys()}
 
         # sample new desired goals and relabel the transitions
         new_goals = self.sample_goals(episode_indices, her_indices, transitions_indices)
@@ -351,8 +424,7 @@ class HerReplayBuffer(DictReplayBuffer):
         # no virtual transition can be created
         if len(her_indices) > 0:
             # Vectorized computation of the new reward
-            transitions["reward"][her_indices, 0] = self.env.env_method(
-                "compute_reward",
+            transitions["reward"][her_indices, 0] = self._compute_reward(
                 # the new state depends on the previous state and action
                 # s_{t+1} = f(s_t, a_t)
                 # so the next_achieved_goal depends also on the previous state and action
@@ -378,16 +450,17 @@ class HerReplayBuffer(DictReplayBuffer):
         next_observations = self._normalize_obs(next_observations, maybe_vec_env)
 
         if online_sampling:
-            next_obs = {key: self.to_torch(next_observations[key][:, 0, :]) for key in self._observation_keys}
+            # The transitions are fresh copies (advanced indexing), no need to copy them again
+            next_obs = {key: self.to_torch(next_observations[key][:, 0, :], copy=False) for key in self._observation_keys}
 
-            normalized_obs = {key: self.to_torch(observations[key][:, 0, :]) for key in self._observation_keys}
+            normalized_obs = {key: self.to_torch(observations[key][:, 0, :], copy=False) for key in self._observation_keys}
 
             return DictReplayBufferSamples(
                 observations=normalized_obs,
-                actions=self.to_torch(transitions["action"]),
+                actions=self.to_torch(transitions["action"], copy=False),
                 next_observations=next_obs,
-                dones=self.to_torch(transitions["done"]),
-                rewards=self.to_torch(self._normalize_reward(transitions["reward"], maybe_vec_env)),
+                dones=self.to_torch(transitions["done"], copy=False),
+                rewards=self.to_torch(self._normalize_reward(transitions["reward"], maybe_vec_env), copy=False),
             )
         else:
             return observations, next_observations, transitions["action"], transitions["reward"]
@@ -402,8 +475,9 @@ class HerReplayBuffer(DictReplayBuffer):
         infos: List[Dict[str, Any]],
     ) -> None:
 
-        if self.current_idx == 0 and self.full:
-            # Clear info buffer
+        if self.current_idx == 0:
+            # Start of a new episode: allocate its info storage
+            # (this also clears the infos of the episode being overwritten)
             self.info_buffer[self.pos] = deque(maxlen=self.max_episode_length)
 
         # Remove termination signals due to timeout
@@ -412,15 +486,18 @@ class HerReplayBuffer(DictReplayBuffer):
         else:
             done_ = done
 
-        self._buffer["observation"][self.pos][self.current_idx] = obs["observation"]
-        self._buffer["achieved_goal"][self.pos][self.current_idx] = obs["achieved_goal"]
-        self._buffer["desired_goal"][self.pos][self.current_idx] = obs["desired_goal"]
-        self._buffer["action"][self.pos][self.current_idx] = action
-        self._buffer["done"][self.pos][self.current_idx] = done_
-        self._buffer["reward"][self.pos][self.current_idx] = reward
-        self._buffer["next_obs"][self.pos][self.current_idx] = next_obs["observation"]
-        self._buffer["next_achieved_goal"][self.pos][self.current_idx] = next_obs["achieved_goal"]
-        self._buffer["next_desired_goal"][self.pos][self.current_idx] = next_obs["desired_goal"]
+        # Write each field directly into its slot (a single indexing operation,
+        # no intermediate view of the episode)
+        transition_idx = (self.pos, self.current_idx)
+        self._buffer["observation"][transition_idx] = obs["observation"]
+        self._buffer["achieved_goal"][transition_idx] = obs["achieved_goal"]
+        self._buffer["desired_goal"][transition_idx] = obs["desired_goal"]
+        self._buffer["action"][transition_idx] = action
+        self._buffer["done"][transition_idx] = done_
+        self._buffer["reward"][transition_idx] = reward
+        self._buffer["next_obs"][transition_idx] = next_obs["observation"]
+        self._buffer["next_achieved_goal"][transition_idx] = next_obs["achieved_goal"]
+        self._buffer["next_desired_goal"][transition_idx] = next_obs["desired_goal"]
 
         # When doing offline sampling
         # Add real transition to normal replay buffer
@@ -481,16 +558,17 @@ class HerReplayBuffer(DictReplayBuffer):
 
         # Store virtual transitions in the replay buffer, if available
         if len(observations) > 0:
-            for i in range(len(observations["observation"])):
-                self.replay_buffer.add(
-                    {key: obs[i] for key, obs in observations.items()},
-                    {key: next_obs[i] for key, next_obs in next_observations.items()},
-                    actions[i],
-                    rewards[i],
-                    # We consider the transition as non-terminal
-                    done=[False],
-                    infos=[{}],
-                )
+            n_transitions = len(actions)
+            # Write all the transitions at once
+            self.replay_buffer.extend(
+                observations,
+                next_observations,
+                actions,
+                rewards,
+                # We consider the transitions as non-terminal
+                done=np.zeros(n_transitions),
+                infos=[[{}]] * n_transitions,
+            )
 
     @property
     def n_episodes_stored(self) -> int:
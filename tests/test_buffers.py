@@ -0,0 +1,146 @@
+import pickle
+
+import numpy as np
+import pytest
+from gym import spaces
+
+from stable_baselines3.common.buffers import DictReplayBuffer, ReplayBuffer
+from stable_baselines3.common.type_aliases import DictReplayBufferSamples, ReplayBufferSamples
+
+
+@pytest.mark.parametrize("n_envs", [1, 4])
+@pytest.mark.parametrize("optimize_memory_usage", [False, True])
+def test_replay_buffer_multi_env(n_envs, optimize_memory_usage):
+    buffer_size, batch_size = 100, 32
+    observation_space = spaces.Box(low=-1, high=1, shape=(3,), dtype=np.float32)
+    action_space = spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32)
+    buffer = ReplayBuffer(
+        buffer_size,
+        observation_space,
+        action_space,
+        n_envs=n_envs,
+        optimize_memory_usage=optimize_memory_usage,
+    )
+    # The storage is shared by all envs
+    assert buffer.buffer_size == buffer_size // n_envs
+    assert buffer.observations.shape == (buffer_size // n_envs, n_envs, 3)
+
+    for step in range(buffer.buffer_size):
+        # Encode env index and step in the observation to check consistency when sampling
+        obs = np.stack([np.full((3,), step * 10 + env_idx, dtype=np.float32) for env_idx in range(n_envs)])
+        next_obs = obs + 1
+        action = np.zeros((n_envs, 2), dtype=np.float32)
+        reward = obs[:, 0]
+        done = np.zeros(n_envs, dtype=bool)
+        buffer.add(obs, next_obs, action, reward, done, [{} for _ in range(n_envs)])
+
+    assert buffer.full
+
+    samples = buffer.sample(batch_size)
+    assert isinstance(samples, ReplayBufferSamples)
+    assert samples.observations.shape == (batch_size, 3)
+    assert samples.actions.shape == (batch_size, 2)
+    assert samples.rewards.shape == (batch_size, 1)
+    assert samples.dones.shape == (batch_size, 1)
+    # Transitions from the same env must stay together
+    assert np.allclose(samples.rewards.numpy().flatten(), samples.observations[:, 0].numpy())
+    if not optimize_memory_usage:
+        assert np.allclose(samples.next_observations.numpy(), samples.observations.numpy() + 1)
+
+
+@pytest.mark.parametrize("n_envs", [1, 2])
+def test_dict_replay_buffer_multi_env(n_envs):
+    buffer_size, batch_size = 50, 16
+    observation_space = spaces.Dict(
+        {
+            "vec": spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32),
+            "discrete": spaces.Discrete(4),
+        }
+    )
+    action_space = spaces.Discrete(3)
+    buffer = DictReplayBuffer(buffer_size, observation_space, action_space, n_envs=n_envs)
+    assert buffer.buffer_size == buffer_size // n_envs
+
+    for step in range(buffer.buffer_size):
+        obs = {
+            "vec": np.full((n_envs, 2), step, dtype=np.float32),
+            "discrete": np.arange(n_envs) % 4,
+        }
+        action = np.arange(n_envs) % 3
+        buffer.add(obs, obs, action, np.ones(n_envs), np.zeros(n_envs), [{} for _ in range(n_envs)])
+
+    samples = buffer.sample(batch_size)
+    assert isinstance(samples, DictReplayBufferSamples)
+    assert samples.observations["vec"].shape == (batch_size, 2)
+    assert samples.observations["discrete"].shape == (batch_size, 1)
+    assert samples.actions.shape == (batch_size, 1)
+    assert samples.rewards.shape == (batch_size, 1)
+    assert samples.dones.shape == (batch_size, 1)
+
+
+def test_dict_replay_buffer_extend():
+    buffer_size = 10
+    observation_space = spaces.Dict(
+        {
+            "vec": spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32),
+            "discrete": spaces.Discrete(4),
+        }
+    )
+    action_space = spaces.Box(low=-1, high=1, shape=(3,), dtype=np.float32)
+    buffer = DictReplayBuffer(buffer_size, observation_space, action_space)
+
+    # Wrap around the end of the circular buffer
+    buffer.pos = buffer_size - 2
+    n_transitions = 4
+    obs = {
+        "vec": np.arange(n_transitions * 2, dtype=np.float32).reshape(n_transitions, 2),
+        "discrete": np.arange(n_transitions) % 4,
+    }
+    actions = np.ones((n_transitions, 3))
+    buffer.extend(obs, obs, actions, np.arange(n_transitions), np.zeros(n_transitions), [[{}]] * n_transitions)
+
+    assert buffer.full
+    assert buffer.pos == 2
+    # Same result as adding the transitions one by one
+    indices = [buffer_size - 2, buffer_size - 1, 0, 1]
+    assert np.allclose(buffer.observations["vec"][indices, 0], obs["vec"])
+    assert np.allclose(buffer.observations["discrete"][indices, 0, 0], obs["discrete"])
+    assert np.allclose(buffer.actions[indices, 0], actions)
+    assert np.allclose(buffer.rewards[indices, 0], np.arange(n_transitions))
+
+    # Batch larger than the buffer: only the last transitions are kept,
+    # same result as adding the transitions one by one
+    n_transitions = buffer_size + 3
+    obs = {
+        "vec": np.arange(n_transitions * 2, dtype=np.float32).reshape(n_transitions, 2),
+        "discrete": np.arange(n_transitions) % 4,
+    }
+    actions = np.arange(n_transitions * 3).reshape(n_transitions, 3)
+    rewards = np.arange(n_transitions)
+    reference_buffer = DictReplayBuffer(buffer_size, observation_space, action_space)
+    reference_buffer.pos = buffer.pos
+    for i in range(n_transitions):
+        obs_ = {key: value[i : i + 1] for key, value in obs.items()}
+        reference_buffer.add(obs_, obs_, actions[i : i + 1], rewards[i : i + 1], np.zeros(1), [{}])
+    buffer.extend(obs, obs, actions, rewards, np.zeros(n_transitions), [[{}]] * n_transitions)
+
+    assert buffer.full
+    assert buffer.pos == reference_buffer.pos
+    for key in obs.keys():
+        assert np.allclose(buffer.observations[key], reference_buffer.observations[key])
+    assert np.allclose(buffer.actions, reference_buffer.actions)
+    assert np.allclose(buffer.rewards, reference_buffer.rewards)
+
+
+def test_load_buffer_without_generator():
+    observation_space = spaces.Box(low=-1, high=1, shape=(2,), dtype=np.float32)
+    action_space = spaces.Box(low=-1, high=1, shape=(1,), dtype=np.float32)
+    buffer = ReplayBuffer(10, observation_space, action_space)
+    for _ in range(5):
+        buffer.add(np.zeros(2), np.zeros(2), np.zeros(1), np.zeros(1), np.zeros(1), [{}])
+    # Buffers pickled with a previous version do not have their own generator
+    del buffer.np_random
+
+    loaded_buffer = pickle.loads(pickle.dumps(buffer))
+    assert isinstance(loaded_buffer.np_random, np.random.Generator)
+    assert loaded_buffer.sample(4).observations.shape == (4, 2)
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from stable_baselines3 import A2C, DQN, PPO, SAC, TD3
@@ -33,3 +34,39 @@ def test_deterministic_training_common(algo):
             rewards[i].append(reward)
     assert sum(results[0]) == sum(results[1]), results
     assert sum(rewards[0]) == sum(rewards[1]), rewards
+
+
+@pytest.mark.parametrize("algo", [DQN, PPO])
+def test_set_random_seed_buffers(algo):
+    kwargs = dict(learning_starts=100, buffer_size=1000) if algo == DQN else dict(n_steps=128)
+    # Different seeds when creating the models
+    models = [algo("MlpPolicy", "CartPole-v1", seed=seed, policy_kwargs=dict(net_arch=[64]), **kwargs) for seed in [0, 1]]
+    for model in models:
+        model.set_random_seed(SEED)
+    buffers = [model.replay_buffer if algo == DQN else model.rollout_buffer for model in models]
+    # The buffers must be re-seeded too
+    assert np.array_equal(buffers[0].np_random.integers(1000, size=32), buffers[1].np_random.integers(1000, size=32))
+
+
+def test_deterministic_replay_sampling():
+    batches = []
+    for _ in range(2):
+        model = DQN("MlpPolicy", "CartPole-v1", learning_starts=100, buffer_size=1000, policy_kwargs=dict(net_arch=[64]))
+        model.set_random_seed(SEED)
+        model.learn(200)
+        batches.append(model.replay_buffer.sample(32))
+    assert np.allclose(batches[0].observations.numpy(), batches[1].observations.numpy())
+    assert np.allclose(batches[0].actions.numpy(), batches[1].actions.numpy())
+
+
+def test_deterministic_dqn_exploration():
+    actions = []
+    for _ in range(2):
+        model = DQN("MlpPolicy", "CartPole-v1", exploration_initial_eps=1.0, policy_kwargs=dict(net_arch=[64]))
+        model.exploration_rate = 1.0
+        model.set_random_seed(SEED)
+        obs = model.get_env().reset()
+        # Vectorized and single observation
+        actions.append([model.predict(obs, deterministic=False)[0] for _ in range(10)])
+        actions[-1] += [model.predict(obs[0], deterministic=False)[0] for _ in range(10)]
+    assert all(np.array_equal(action_1, action_2) for action_1, action_2 in zip(*actions))
@@ -9,6 +9,7 @@ import pytest
 import torch as th
 
 from stable_baselines3 import DDPG, DQN, SAC, TD3, HerReplayBuffer
+from stable_baselines3.common.buffers import DictReplayBuffer
 from stable_baselines3.common.envs import BitFlippingEnv
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
@@ -329,6 +330,86 @@ def test_full_replay_buffer():
     model.learn(total_timesteps=100)
 
 
+def test_offline_sampling_infos():
+    """
+    Test that with offline sampling, the infos passed to ``compute_reward()``
+    belong to the episode being relabeled, even when it is shorter than the previous one.
+    """
+    n_bits = 4
+    env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=n_bits)])
+    replay_buffer = DictReplayBuffer(100, env.observation_space, env.action_space)
+    her_buffer = HerReplayBuffer(env, 100, replay_buffer=replay_buffer, max_episode_length=n_bits, online_sampling=False)
+
+    reward_infos = []
+    bit_flipping_env = env.envs[0]
+    compute_reward = bit_flipping_env.compute_reward
+
+    def recording_compute_reward(achieved_goal, desired_goal, info):
+        # The env itself calls `compute_reward()` without infos in `step()`
+        if info is not None:
+            reward_infos.extend(np.ravel(info))
+        return compute_reward(achieved_goal, desired_goal, info)
+
+    bit_flipping_env.compute_reward = recording_compute_reward
+
+    # A full episode followed by a shorter one
+    for episode_idx, episode_length in enumerate([n_bits, 2]):
+        reward_infos.clear()
+        obs = env.reset()
+        for step in range(episode_length):
+            action = np.array([env.action_space.sample()])
+            next_obs, reward, _, _ = env.step(action)
+            done = np.array([step == episode_length - 1])
+            her_buffer.add(obs, next_obs, action, reward, done, [{"episode_idx": episode_idx}])
+            obs = next_obs
+
+        assert len(reward_infos) > 0
+        assert all(info["episode_idx"] == episode_idx for info in reward_infos)
+
+
+def test_seed_offline_sampling():
+    env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=4)])
+    replay_buffer = DictReplayBuffer(100, env.observation_space, env.action_space)
+    her_buffer = HerReplayBuffer(env, 100, replay_buffer=replay_buffer, max_episode_length=4, online_sampling=False)
+
+    draws = []
+    for _ in range(2):
+        her_buffer.seed(0)
+        draws.append((her_buffer.np_random.integers(1000, size=32), replay_buffer.np_random.integers(1000, size=32)))
+    # Reproducible, but the two generators are independent
+    assert np.array_equal(draws[0][0], draws[1][0])
+    assert np.array_equal(draws[0][1], draws[1][1])
+    assert not np.array_equal(draws[0][0], draws[0][1])
+
+
+def test_extend():
+    n_bits = 4
+    env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=n_bits)])
+    her_buffer = HerReplayBuffer(env, 100, max_episode_length=n_bits)
+
+    # One episode, the first dimension is the batch dimension
+    obs = env.reset()
+    transitions = []
+    for step in range(n_bits):
+        action = np.array([env.action_space.sample()])
+        next_obs, reward, _, _ = env.step(action)
+        transitions.append((obs, next_obs, action, reward, np.array([step == n_bits - 1]), [{}]))
+        obs = next_obs
+    observations, next_observations, actions, rewards, dones, infos = zip(*transitions)
+    her_buffer.extend(
+        {key: np.stack([obs[key] for obs in observations]) for key in env.observation_space.spaces.keys()},
+        {key: np.stack([obs[key] for obs in next_observations]) for key in env.observation_space.spaces.keys()},
+        np.stack(actions),
+        np.stack(rewards),
+        np.stack(dones),
+        list(infos),
+    )
+
+    assert her_buffer.n_episodes_stored == 1
+    assert her_buffer.size() == n_bits
+    assert her_buffer.sample(8, env=None).actions.shape[0] == 8
+
+
 def test_get_max_episode_length():
     dict_env = DummyVecEnv([lambda: BitFlippingEnv()])
 
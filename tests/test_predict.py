@@ -1,9 +1,10 @@
 import gym
+import numpy as np
 import pytest
 import torch as th
 
 from stable_baselines3 import A2C, DQN, PPO, SAC, TD3
-from stable_baselines3.common.utils import get_device
+from stable_baselines3.common.utils import get_device, obs_as_tensor
 from stable_baselines3.common.vec_env import DummyVecEnv
 
 MODEL_LIST = [
@@ -69,3 +70,37 @@ def test_predict(model_class, env_id, device):
 
         action, _ = model.predict(vec_env_obs, deterministic=False)
         assert action.shape[0] == vec_env_obs.shape[0]
+
+
+@pytest.mark.parametrize("model_class", [A2C, PPO])
+@pytest.mark.parametrize("env_id", ["Pendulum-v0", "CartPole-v1"])
+def test_predict_values(model_class, env_id):
+    model = model_class("MlpPolicy", env_id, policy_kwargs=dict(net_arch=[16, dict(pi=[8], vf=[8])]))
+    vec_env = DummyVecEnv([lambda: gym.make(env_id), lambda: gym.make(env_id)])
+
+    obs = vec_env.reset()
+    obs_tensor = obs_as_tensor(obs, model.device)
+    actions = th.as_tensor(model.predict(obs)[0], device=model.device)
+
+    with th.no_grad():
+        values = model.policy.predict_values(obs_tensor)
+        _, forward_values, _ = model.policy(obs_tensor)
+        evaluate_values, _, _ = model.policy.evaluate_actions(obs_tensor, actions)
+
+    assert values.shape == (vec_env.num_envs, 1)
+    assert th.allclose(values, forward_values)
+    assert th.allclose(values, evaluate_values)
+
+
+@pytest.mark.parametrize("model_class", MODEL_LIST)
+def test_predict_does_not_modify_obs(model_class):
+    env_id = "CartPole-v1" if model_class in [A2C, PPO, DQN] else "Pendulum-v0"
+    model = model_class("MlpPolicy", env_id)
+    vec_env = DummyVecEnv([lambda: gym.make(env_id), lambda: gym.make(env_id)])
+
+    # The observation passed to `predict()` may be shared with the input tensor (no copy on CPU)
+    obs = vec_env.reset()
+    obs_copy = obs.copy()
+    model.predict(obs, deterministic=True)
+    model.predict(obs[0], deterministic=True)
+    assert np.array_equal(obs, obs_copy)
@@ -1,8 +1,13 @@
+import sys
+
 import numpy as np
 import pytest
 
 from stable_baselines3 import A2C, DDPG, DQN, PPO, SAC, TD3
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.envs import BitFlippingEnv
 from stable_baselines3.common.noise import NormalActionNoise, OrnsteinUhlenbeckActionNoise
+from stable_baselines3.common.vec_env import DummyVecEnv
 
 normal_action_noise = NormalActionNoise(np.zeros(1), 0.1 * np.ones(1))
 
@@ -139,3 +144,102 @@ def test_train_freq_fail(train_freq):
             train_freq=train_freq,
         )
         model.learn(total_timesteps=250)
+
+
+@pytest.mark.parametrize("model_class", [SAC, TD3, DQN])
+def test_offpolicy_multi_env(model_class):
+    kwargs = {}
+    if model_class in [SAC, TD3]:
+        env_id = "Pendulum-v0"
+        policy_kwargs = dict(net_arch=[64], n_critics=1)
+        # Check auto-conversion to VectorizedActionNoise
+        kwargs = dict(action_noise=NormalActionNoise(np.zeros(1), 0.1 * np.ones(1)))
+    else:
+        env_id = "CartPole-v1"
+        policy_kwargs = dict(net_arch=[64])
+
+    env = make_vec_env(env_id, n_envs=2)
+    model = model_class(
+        "MlpPolicy",
+        env,
+        policy_kwargs=policy_kwargs,
+        learning_starts=100,
+        buffer_size=10000,
+        verbose=0,
+        train_freq=5,
+        **kwargs,
+    )
+    model.learn(total_timesteps=300)
+    # One call to `env.step()` corresponds to `n_envs` transitions
+    assert model.num_timesteps == 300
+    assert model.replay_buffer.n_envs == 2
+
+
+def test_offpolicy_multi_env_load(tmp_path):
+    model = DQN("MlpPolicy", make_vec_env("CartPole-v1", n_envs=2), buffer_size=1000, policy_kwargs=dict(net_arch=[64]))
+    model.save(tmp_path / "dqn_cartpole")
+    # The buffers must be created with the number of envs of the new env
+    model = DQN.load(tmp_path / "dqn_cartpole", env=make_vec_env("CartPole-v1", n_envs=3))
+    assert model.n_envs == 3
+    assert model.replay_buffer.n_envs == 3
+    model.learn(total_timesteps=150)
+
+
+def test_offpolicy_warmup_actions(tmp_path):
+    n_envs, learning_starts = 2, 51
+    warmup_actions = []
+    for _ in range(2):
+        env = make_vec_env("Pendulum-v0", n_envs=n_envs)
+        model = SAC("MlpPolicy", env, learning_starts=learning_starts, policy_kwargs=dict(net_arch=[64]), seed=0)
+        # Only the warm up phase (an odd number of transitions with two envs)
+        model.learn(total_timesteps=learning_starts)
+        assert model.replay_buffer.size() * n_envs >= learning_starts
+        warmup_actions.append(model.replay_buffer.actions[: model.replay_buffer.size()])
+
+    # One different random action per env and per step, within the bounds
+    assert warmup_actions[0].shape[1:] == (n_envs,) + model.action_space.shape
+    assert np.all(np.abs(warmup_actions[0]) <= 1.0)
+    assert len(np.unique(warmup_actions[0])) == warmup_actions[0].size
+    # Same seed, same actions
+    assert np.array_equal(warmup_actions[0], warmup_actions[1])
+
+    # The model can still be saved, loaded and trained
+    model.save(tmp_path / "sac_pendulum")
+    model = SAC.load(tmp_path / "sac_pendulum", env=make_vec_env("Pendulum-v0", n_envs=n_envs))
+    model.learn(total_timesteps=10, reset_num_timesteps=False)
+
+
+def test_dqn_target_update_interval_multi_env(monkeypatch):
+    env = make_vec_env("CartPole-v1", n_envs=4)
+    # The target network would be updated after each call to `env.step()`
+    with pytest.warns(UserWarning):
+        DQN("MlpPolicy", env, target_update_interval=2)
+
+    model = DQN("MlpPolicy", env, target_update_interval=8, policy_kwargs=dict(net_arch=[64]))
+    target_updates = []
+    monkeypatch.setattr(sys.modules[DQN.__module__], "polyak_update", lambda *_: target_updates.append(model.num_timesteps))
+    # 8 calls to `env.step()`
+    model.learn(total_timesteps=32)
+    # 8 transitions correspond to 2 calls to `env.step()` with 4 envs
+    assert target_updates == [8, 16, 24, 32]
+
+
+def test_offpolicy_multi_env_terminal_obs():
+    n_envs = 2
+    env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=4) for _ in range(n_envs)])
+    model = DQN("MultiInputPolicy", env, buffer_size=100)
+    model._last_obs = env.reset()
+
+    new_obs = {key: np.zeros_like(obs) for key, obs in model._last_obs.items()}
+    terminal_obs = {key: np.ones_like(obs[0]) for key, obs in model._last_obs.items()}
+    # Only the second env finished its episode
+    dones = np.array([False, True])
+    infos = [{}, {"terminal_observation": terminal_obs}]
+    model._store_transition(model.replay_buffer, np.arange(n_envs), new_obs, np.zeros(n_envs), dones, infos)
+
+    for key in new_obs.keys():
+        next_observations = model.replay_buffer.next_observations[key][0]
+        assert np.allclose(next_observations[0], new_obs[key][0])
+        assert np.allclose(next_observations[1], infos[1]["terminal_observation"][key])
+        # The observation of the next step must not be modified
+        assert np.allclose(model._last_obs[key], 0)
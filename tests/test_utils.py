@@ -9,10 +9,11 @@ import torch as th
 from stable_baselines3 import A2C, PPO
 from stable_baselines3.common.atari_wrappers import ClipRewardEnv, MaxAndSkipEnv
 from stable_baselines3.common.env_util import is_wrapped, make_atari_env, make_vec_env, unwrap_wrapper
+from stable_baselines3.common.envs import BitFlippingEnv
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
 from stable_baselines3.common.noise import ActionNoise, OrnsteinUhlenbeckActionNoise, VectorizedActionNoise
-from stable_baselines3.common.utils import polyak_update, zip_strict
+from stable_baselines3.common.utils import inference_mode, polyak_update, zip_strict
 from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
 
 
@@ -334,6 +335,15 @@ def test_polyak():
     assert th.allclose(param2, target2)
 
 
+def test_inference_mode():
+    param = th.nn.Parameter(th.ones((5, 5)))
+    with inference_mode():
+        output = param * 2
+    assert not output.requires_grad
+    # The output can still be converted to numpy and stored (e.g. in a rollout buffer)
+    assert np.allclose(output.clone().cpu().numpy(), 2.0)
+
+
 def test_zip_strict():
     # Iterables with different lengths
     list_a = [0, 1]
@@ -376,3 +386,27 @@ def test_ppo_warnings():
     # Truncated mini-batch
     with pytest.warns(UserWarning):
         PPO("MlpPolicy", "Pendulum-v0", n_steps=6, batch_size=8)
+
+
+def test_update_info_buffer():
+    model = PPO("MlpPolicy", "CartPole-v1")
+    model._setup_learn(total_timesteps=0, eval_env=None)
+
+    ep_info = {"r": 1.0, "l": 1, "t": 0.0}
+    # Only the infos of the envs that finished an episode are checked
+    infos = [{"episode": ep_info, "is_success": True}, {"is_success": False}, {"episode": ep_info, "is_success": False}]
+    model._update_info_buffer(infos, np.array([True, False, True]))
+    assert list(model.ep_info_buffer) == [ep_info, ep_info]
+    assert list(model.ep_success_buffer) == [True, False]
+
+    # Without termination signals, only the episode infos are retrieved
+    model._update_info_buffer(infos)
+    assert len(model.ep_info_buffer) == 4
+    assert len(model.ep_success_buffer) == 2
+
+
+def test_on_policy_success_rate():
+    env = DummyVecEnv([lambda: BitFlippingEnv(n_bits=4) for _ in range(2)])
+    model = PPO("MultiInputPolicy", env, n_steps=32, batch_size=32)
+    model.learn(total_timesteps=64)
+    assert len(model.ep_success_buffer) > 0
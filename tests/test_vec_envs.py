@@ -8,7 +8,7 @@ import numpy as np
 import pytest
 
 from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecFrameStack, VecNormalize
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecCastObservation, VecFrameStack, VecNormalize
 
 N_ENVS = 3
 VEC_ENV_CLASSES = [DummyVecEnv, SubprocVecEnv]
@@ -440,3 +440,24 @@ def test_vec_env_is_wrapped():
 
     vec_env = VecFrameStack(vec_env, n_stack=2)
     assert vec_env.env_is_wrapped(Monitor) == [False, True]
+
+
+def test_vec_cast_observation():
+    def make_env():
+        return CustomGymEnv(gym.spaces.Box(low=np.zeros(2), high=np.ones(2), dtype=np.float64))
+
+    vec_env = VecCastObservation(DummyVecEnv([make_env for _ in range(N_ENVS)]))
+    assert vec_env.observation_space.dtype == np.float32
+    assert vec_env.observation_space.low.dtype == np.float32
+    assert vec_env.observation_space.high.dtype == np.float32
+    assert vec_env.observation_space.shape == (2,)
+
+    obs = vec_env.reset()
+    assert obs.dtype == np.float32
+    # Episodes last 4 steps
+    for _ in range(4):
+        obs, rewards, dones, infos = vec_env.step(np.zeros((N_ENVS, 2)))
+        assert obs.dtype == np.float32
+        assert rewards.dtype == np.float32
+    assert dones.all()
+    assert all(info["terminal_observation"].dtype == np.float32 for info in infos)